@@ -45,7 +45,7 @@ def active_test(
 
 
 @api.post("/login", response_model=Token, tags=["Auth"])
-async def authenticate(
+def authenticate(
     login_data: LoginData,
     auth_service: AuthService = Depends(),
     team_service: TeamService = Depends(),
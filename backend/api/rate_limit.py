@@ -0,0 +1,59 @@
+"""Dependency to limit how often a team can call a group of API routes"""
+
+import time
+from collections import deque
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
+
+from .auth import bearer_scheme
+from ..services.auth import AuthService
+from ..services.exceptions import TooManyRequestsException
+
+
+class RateLimiter:
+    """Sliding window rate limiter keyed by the team encoded in the login token.
+
+    Add an instance to a router's dependencies to limit every route in it. Request times
+    are kept in memory, which is enough for the single uvicorn process serving the API.
+    """
+
+    def __init__(self, times: int, seconds: float):
+        self._times = times
+        self._seconds = seconds
+        self._requests: dict[str, deque[float]] = {}
+        self._last_sweep = time.monotonic()
+
+    async def __call__(
+        self,
+        credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+        auth_service: AuthService = Depends(),
+    ) -> None:
+        """Records a request, raising TooManyRequestsException if the limit is reached.
+        Async so it runs on the event loop and never races with itself across threads.
+
+        Raises:
+            InvalidCredentialsException: If the token is invalid, so junk tokens are never tracked
+            TooManyRequestsException: If the team has used up its requests for the window
+        """
+        team_name = auth_service.decode_token(credentials.credentials).name
+        now = time.monotonic()
+        window_start = now - self._seconds
+
+        # Drop teams that have not sent a request within the window
+        if now - self._last_sweep >= self._seconds:
+            for name in [
+                name
+                for name, requests in self._requests.items()
+                if not requests or requests[-1] <= window_start
+            ]:
+                del self._requests[name]
+            self._last_sweep = now
+
+        requests = self._requests.setdefault(team_name, deque())
+        while requests and requests[0] <= window_start:
+            requests.popleft()
+        if len(requests) >= self._times:
+            raise TooManyRequestsException(
+                "Too many requests, please wait a moment and try again."
+            )
+        requests.append(now)
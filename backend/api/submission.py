@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 from ..models import Team, Submission, ConsoleLog
 from ..services.submissions import SubmissionService
 from .auth import active_test
+from .rate_limit import RateLimiter
 import sys
 
 __authors__ = ["Nicholas Almy"]
@@ -13,14 +14,17 @@ openapi_tags = {
     "description": "Routes for Submission management",
 }
 
-api = APIRouter(prefix="/api/submissions")
+api = APIRouter(
+    prefix="/api/submissions",
+    dependencies=[Depends(RateLimiter(times=5, seconds=10))],
+)
 
 
 @api.post("/submit", response_model=ConsoleLog, tags=["Submissions"])
-def submit_and_run(
+async def submit_and_run(
     submission: Submission,
     team: Team = Depends(active_test),
     submission_svc: SubmissionService = Depends(),
 ) -> ConsoleLog:
     """Store and sample grade a submission."""
-    return submission_svc.submit_and_run(team, submission)
+    return await submission_svc.submit_and_run(team, submission)
@@ -6,10 +6,13 @@ from ..models.team import TeamPublic, Team
 from ..services.team import TeamService
 from ..models.team_members import TeamMemberCreate, TeamMemberPublic
 from .auth import authed_team
+from .rate_limit import RateLimiter
 
 __authors__ = ["Andrew Lockard", "Mustafa Aljumayli"]
 
-api = APIRouter(prefix="/api/team")
+api = APIRouter(
+    prefix="/api/team", dependencies=[Depends(RateLimiter(times=60, seconds=60))]
+)
 
 openapi_tags = {"name": "Teams", "description": "Routes for Teams and TeamMembers."}
 
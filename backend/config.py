@@ -8,3 +8,5 @@ load_dotenv(os.path.join(os.getcwd(), "backend/.env.development"))
 # Access the environment variables
 SECRET_KEY = os.getenv("SECRET_KEY")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+# Logs every SQL statement, only turn on while developing
+DATABASE_ECHO = os.getenv("DATABASE_ECHO", "False").lower() == "true"
@@ -2,13 +2,25 @@
 
 from sqlmodel import create_engine, Session
 
+from .config import DATABASE_ECHO
+
 __authors__ = ["Andrew Lockard"]
 
 sqlite_file_name = "database.db"
 sqlite_url = f"sqlite:///backend/{sqlite_file_name}"
 
-# TODO: Create script to turn off echo when NOT in development mode
-engine = create_engine(sqlite_url, echo=True)
+# Sized for contest load: every API request checks out a connection, so the
+# default pool (5 + 10 overflow) is exhausted quickly by polling clients.
+# pool_pre_ping discards stale connections before they are handed out.
+engine = create_engine(
+    sqlite_url,
+    echo=DATABASE_ECHO,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    connect_args={"check_same_thread": False},
+)
 
 
 def db_session():
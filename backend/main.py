@@ -1,18 +1,21 @@
 """Entry of the backend for the SOTesting Environment. Sets up FastAPI and exception handlers"""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette_compress import CompressMiddleware
 
 from .services.exceptions import (
     InvalidCredentialsException,
     ResourceNotFoundException,
     ResourceNotAllowedException,
+    TooManyRequestsException,
 )
 
 from .api import team, auth, question, docs, submission, static_files
+from .services.submissions import judge0_client
 
 __authors__ = ["Andrew Lockard", "Mustafa Aljumayli"]
 
@@ -20,6 +23,14 @@ description = """
 This RESTful API is designed to allow Science Olympiad students to submit code for grading purposes as a part of a coding competition.
 """
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Closes the pooled Judge0 connections when the server shuts down"""
+    yield
+    await judge0_client.aclose()
+
+
 app = FastAPI(
     title="Science Olympiad Testing Environment API",
     version="1.0.0",
@@ -31,10 +42,19 @@ app = FastAPI(
         docs.openapi_tags,
         submission.openapi_tags,
     ],
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
-app.add_middleware(GZipMiddleware)
+# Negotiates zstd, brotli or gzip from Accept-Encoding, tiny JSON bodies are sent as is
+app.add_middleware(
+    CompressMiddleware,
+    minimum_size=500,
+    zstd_level=4,
+    brotli_quality=4,
+    gzip_level=6,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:4400"],  # Frontend URL
@@ -58,14 +78,14 @@ app.mount("/", static_files.CustomStatic(directory=Path("./static")))
 def resource_not_found_exception_handler(
     request: Request, e: ResourceNotFoundException
 ):
-    return JSONResponse(status_code=404, content={"message": str(e)})
+    return ORJSONResponse(status_code=404, content={"message": str(e)})
 
 
 @app.exception_handler(InvalidCredentialsException)
 def invalid_credentials_exception_handler(
     request: Request, e: InvalidCredentialsException
 ):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=401,
         content={"message": str(e)},
     )
@@ -75,4 +95,9 @@ def invalid_credentials_exception_handler(
 def resource_not_allowed_exception_handler(
     request: Request, e: ResourceNotAllowedException
 ):
-    return JSONResponse(status_code=403, content={"message": str(e)})
+    return ORJSONResponse(status_code=403, content={"message": str(e)})
+
+
+@app.exception_handler(TooManyRequestsException)
+def too_many_requests_exception_handler(request: Request, e: TooManyRequestsException):
+    return ORJSONResponse(status_code=429, content={"message": str(e)})
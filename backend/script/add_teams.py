@@ -43,6 +43,7 @@ def add_teams():
             )
             team: TeamData = team_svc.create_team(team)
             team_list.append(team)
+        session.commit()
         # Add new teams to the table
         team_table = (
             team_svc.teams_to_df(team_list).unique().sort(["Start Time", "Team Number"])
@@ -2,6 +2,7 @@
 
 from sqlmodel import Session
 import polars as pl
+import asyncio
 
 from ..services import SubmissionService, TeamService, QuestionService
 from ..models import Team, ScoredTest
@@ -10,23 +11,39 @@ from ..db import engine
 DEFAULT_BY_TEST_FILE = "es_files/teams/scored_tests.csv"
 DEFAULT_TOTAL_FILE = "es_files/teams/final_scores.csv"
 
+# Submissions graded at once, kept well under Judge0's default MAX_QUEUE_SIZE of 100
+# and the 50 connections the Judge0 client pools
+MAX_CONCURRENT_GRADES = 20
 
-def main():
+
+async def main():
     q_svc = QuestionService()
     sub_svc = SubmissionService()
     with Session(engine) as session:
         team_svc = TeamService(session)
         teams = team_svc.get_all_teams()
 
-    # TODO: Could make this multithreaded
-    test_list: list[pl.DataFrame] = []
-    for team in teams:
-        for q_num in range(1, q_svc.get_question_count() + 1):
-            dfs = [
-                create_test_df(team.name, test)
-                for test in sub_svc.grade_submission(q_num, team.name)
-            ]
-            test_list.extend(dfs)
+    question_count = q_svc.get_question_count()
+    graded = [
+        (team.name, q_num) for team in teams for q_num in range(1, question_count + 1)
+    ]
+
+    # Keep a bounded number of submissions queued on Judge0 and poll for their results concurrently
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_GRADES)
+
+    async def grade(team_name: str, q_num: int) -> list[ScoredTest]:
+        async with semaphore:
+            return await sub_svc.grade_submission(q_num, team_name)
+
+    results = await asyncio.gather(
+        *[grade(team_name, q_num) for team_name, q_num in graded]
+    )
+
+    test_list: list[pl.DataFrame] = [
+        create_test_df(team_name, test)
+        for (team_name, _), tests in zip(graded, results)
+        for test in tests
+    ]
 
     test_table = pl.concat(test_list)
     test_table.write_csv(DEFAULT_BY_TEST_FILE)
@@ -53,4 +70,4 @@ def create_test_df(team_name: str, test: ScoredTest) -> pl.DataFrame:
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,7 +1,7 @@
 import sys
 from fastapi import Depends
 from sqlmodel import Session
-from ..services import TeamService, PasswordService, ResourceNotFoundException
+from ..services import TeamService, PasswordService
 from ..models import TeamData
 from ..db import engine
 import polars as pl
@@ -50,12 +50,9 @@ def load_teams():
             teamList=team_list, team_svc=team_svc
         )
 
-        for team in team_list:
-            # Update teams or create them if they do not exist
-            try:
-                team_svc.update_team(team)
-            except ResourceNotFoundException as e:
-                team: TeamData = team_svc.create_team(team)
+        # Update teams or create them if they do not exist
+        team_svc.upsert_teams(team_list)
+        session.commit()
 
         team_table = (
             team_svc.teams_to_df(team_list).unique().sort(["Start Time", "Team Number"])
@@ -1,7 +1,7 @@
 import sys
 from fastapi import Depends
 from sqlmodel import Session
-from ..services import TeamService, PasswordService, ResourceNotFoundException
+from ..services import TeamService, PasswordService
 from ..models import TeamData
 from ..db import engine
 import polars as pl
@@ -45,22 +45,18 @@ def teams_to_db():
             teamList=team_list, team_svc=team_svc
         )
         # Delete teams not in the file
-        all_teams = team_svc.get_all_teams()
-        for db_team in all_teams:
-            present = False
-            for target_team in team_list:
-                if db_team.name == target_team.name:
-                    present = True
-                    break
-            if not present:
-                team_svc.delete_team(db_team)
-
-        for team in team_list:
-            # Update teams or create them if they do not exist
-            try:
-                team_svc.update_team(team)
-            except ResourceNotFoundException as e:
-                team = team_svc.create_team(team)
+        file_team_names = {team.name for team in team_list}
+        team_svc.delete_teams(
+            [
+                db_team
+                for db_team in team_svc.get_all_teams()
+                if db_team.name not in file_team_names
+            ]
+        )
+
+        # Update teams or create them if they do not exist
+        team_svc.upsert_teams(team_list)
+        session.commit()
 
         team_table = (
             team_svc.teams_to_df(team_list).unique().sort(["Start Time", "Team Number"])
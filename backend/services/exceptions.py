@@ -17,3 +17,9 @@ class ResourceNotAllowedException(Exception):
     """Raised when a user attempts to access a forbidden resource without valid permissions"""
 
     ...
+
+
+class TooManyRequestsException(Exception):
+    """Raised when a user sends more requests to a route than its rate limit allows"""
+
+    ...
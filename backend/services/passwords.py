@@ -1,6 +1,5 @@
 """Service to handle password generation and management"""
 
-from backend.services.exceptions import ResourceNotFoundException
 from ..db import db_session
 from fastapi import Depends
 from sqlmodel import Session, select
@@ -33,18 +32,17 @@ class PasswordService:
         Returns:
             list[Team]: List of teams with updated passwords
         """
+        # Load every stored password in one query instead of one get_team per team
+        db_passwords = {
+            db_team.name: db_team.password for db_team in team_svc.get_all_teams()
+        }
         for team in teamList:
-            try:
-                db_team = team_svc.get_team(team.name)
-            except ResourceNotFoundException:
-                if team.password == None:
-                    team.password = self.generate_password()
-
             if team.password == None:
-                if db_team.password == None:
+                db_password = db_passwords.get(team.name)
+                if db_password == None:
                     team.password = self.generate_password()
                 else:
-                    team.password = db_team.password
+                    team.password = db_password
         return teamList
 
     def generate_password(self) -> str:
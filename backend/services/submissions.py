@@ -2,10 +2,14 @@
 
 import os
 import json
-import requests  # type: ignore
+import asyncio
 import base64
+import hashlib
+import httpx
+from functools import lru_cache
 from io import BytesIO  # Creates an in-memory "file"
-from zipfile import ZipFile
+from pathlib import Path
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
 
 from ..models import Submission, ConsoleLog, Team, ScoredTest
 from backend.services.exceptions import ResourceNotFoundException
@@ -13,40 +17,55 @@ from backend.services.exceptions import ResourceNotFoundException
 __authors__ = ["Nicholas Almy", "Andrew Lockard"]
 
 submissions_dir = "es_files/submissions"
+utils_dir = "backend/autograder_utils"
+
+# Shared by every request so connections to Judge0 are pooled and kept alive
+judge0_client = httpx.AsyncClient(
+    base_url="http://host.docker.internal:2358",
+    timeout=60.0,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+)
+JUDGE0_PENDING_STATUSES = (1, 2)  # In Queue, Processing
+# Longest a queued submission is polled before giving up on it
+JUDGE0_MAX_WAIT_SECONDS = 120.0
+JUDGE0_RESULTS_CACHE_SIZE = 1024
+
+# Lines of a syntax error stack trace worth showing to students
+SYNTAX_ERROR_LINES = frozenset((1, 8, 9, 10, 11))
 
 
 class SubmissionService:
     """Service that deals with Submission CRUD operations"""
 
+    # Maps sha256 hashes of submission zips to their judge0 test results
+    _judge0_results: dict[str, list[dict]] = {}
+
     def __init__(self):
         self._max_points: dict[int, int] = (
             {}
         )  # Maps question numbers to their max amount of points
 
-    def submit(self, team_name: str, submission: Submission) -> None:
+    async def submit(self, team_name: str, submission: Submission) -> None:
         """Submit a file to the submission folder... Only supports Python files"""
-        # sys.stdout.write(f"Debug: Team name is {team_name}")
-        question_dir = f"q{submission.question_num}"
-        file = f"{team_name}.py"
+        # Disk writes block, so run them in a worker thread to keep the event loop free
+        await asyncio.to_thread(self.write_submission, team_name, submission)
 
-        # Create the submission directory if it doesn't exist
-        if not os.path.exists(submissions_dir):
-            os.makedirs(submissions_dir)
+    def write_submission(self, team_name: str, submission: Submission) -> None:
+        """Writes a submission file to the submission folder"""
+        question_dir = Path(submissions_dir, f"q{submission.question_num}")
 
-        # Create the question directory if it doesn't exist
-        if not os.path.exists(os.path.join(submissions_dir, question_dir)):
-            os.makedirs(os.path.join(submissions_dir, question_dir))
+        # Create the submission and question directories if they don't exist
+        question_dir.mkdir(parents=True, exist_ok=True)
 
         # Write the file to the submission directory
-        with open(os.path.join(submissions_dir, question_dir, file), "w") as f:
-            f.write(submission.file_contents)
+        (question_dir / f"{team_name}.py").write_text(submission.file_contents)
 
-    def submit_and_run(self, team: Team, submission: Submission) -> ConsoleLog:
+    async def submit_and_run(self, team: Team, submission: Submission) -> ConsoleLog:
         """Submit a file to the submission folder, runs it and returns the console logs"""
-        self.submit(team.name, submission)
-        return self.run_submission(submission.question_num, team.name)
+        await self.submit(team.name, submission)
+        return await self.run_submission(submission.question_num, team.name)
 
-    def run_submission(self, question_num: int, team_name: str) -> ConsoleLog:
+    async def run_submission(self, question_num: int, team_name: str) -> ConsoleLog:
         """Run a submission on an Autograder and return the console logs
         Args:
             question_num (int): The question number
@@ -54,8 +73,11 @@ class SubmissionService:
         Returns:
             ConsoleLog: The console log of the submission
         """
-        submission_zip = self.package_submission(team_name, question_num, True)
-        test_results = self.send_to_judge0(submission_zip)
+        # Reading back the file submit just wrote and compressing it blocks too
+        submission_zip = await asyncio.to_thread(
+            self.package_submission, team_name, question_num, True
+        )
+        test_results = await self.send_to_judge0(submission_zip)
         print(test_results)
         out_str = (
             "Note: These tests may or may not be used in final score calculation.\n"
@@ -65,17 +87,18 @@ class SubmissionService:
                 if test["output"][-16:] == "invalid syntax\n\n":
                     # Invalid syntax needs stack trace cleanup
                     output_lines: list[str] = test["output"].splitlines()
-                    lines_to_inlcude = [1, 8, 9, 10, 11]
-                    out_str += f"Running tests failed due to a syntax error.\n{"\n".join([line for i,line in enumerate(output_lines) if i in lines_to_inlcude])}\n"
+                    out_str += f"Running tests failed due to a syntax error.\n{"\n".join(line for i,line in enumerate(output_lines) if i in SYNTAX_ERROR_LINES)}\n"
                 else:
                     # Runtime errors and test failures look good already
-                    out_str += f"{test['name'].split(" ")[0]} {test['output']}"
+                    out_str += f"{test['name'].partition(" ")[0]} {test['output']}"
             else:
-                out_str += f"{test['name'].split(" ")[0]} passed!\n"
+                out_str += f"{test['name'].partition(" ")[0]} passed!\n"
 
         return ConsoleLog(console_log=out_str[:-1])
 
-    def grade_submission(self, question_num: int, team_name: str) -> list[ScoredTest]:
+    async def grade_submission(
+        self, question_num: int, team_name: str
+    ) -> list[ScoredTest]:
         """Grades a students submission against test questions
         Args:
             question_num (int): the question number that we are trying to grade
@@ -86,8 +109,11 @@ class SubmissionService:
         """
 
         try:
-            submission_zip = self.package_submission(team_name, question_num, False)
-            test_results = self.send_to_judge0(submission_zip)
+            # Reading and compressing the files blocks, so package in a worker thread
+            submission_zip = await asyncio.to_thread(
+                self.package_submission, team_name, question_num, False
+            )
+            test_results = await self.send_to_judge0(submission_zip)
         except ResourceNotFoundException as e:
             return [
                 ScoredTest(
@@ -95,7 +121,9 @@ class SubmissionService:
                     test_name=f"Question {question_num} Tests",
                     question_num=question_num,
                     score=0.0,
-                    max_score=self.get_max_points(question_num),
+                    max_score=await asyncio.to_thread(
+                        self.get_max_points, question_num
+                    ),
                 )
             ]
 
@@ -131,7 +159,9 @@ class SubmissionService:
                         console_log=test["output"],
                         test_name=test["name"],
                         score=0,
-                        max_score=self.get_max_points(question_num),
+                        max_score=await asyncio.to_thread(
+                            self.get_max_points, question_num
+                        ),
                         question_num=question_num,
                     )
                 )
@@ -156,15 +186,21 @@ class SubmissionService:
             self._max_points[question_num] = total_weight
             return total_weight
 
-    def send_to_judge0(self, submission_zip: bytes):
-        """Sends the submission zip to judge0
+    async def send_to_judge0(self, submission_zip: bytes):
+        """Sends the submission zip to judge0 and waits for its results
         Args:
             submission_zip: the zip file containing all code to be executed in the judge0 environment
         Returns:
             A list of tests in this JSON form: {"name": str, "score": int, "max_score": int, "status": str, "output": str (only included if test failed)}
         """
-        res = requests.post(
-            "http://host.docker.internal:2358/submissions?wait=true",
+        # Resubmitting unchanged code against unchanged tests produces the same zip
+        zip_hash = hashlib.sha256(submission_zip).hexdigest()
+        if zip_hash in SubmissionService._judge0_results:
+            return SubmissionService._judge0_results[zip_hash]
+
+        # Queue the submission without holding the connection open while it runs
+        res = await judge0_client.post(
+            "/submissions?wait=false",
             headers={"Content-Type": "application/json"},
             json={
                 "additional_files": submission_zip.decode("utf-8"),
@@ -177,10 +213,48 @@ class SubmissionService:
                 "Judge0 did not return as expected, please ensure it is running and try again."
             )
 
-        res_output = res.json()
+        res_output = await self.poll_judge0(res.json()["token"])
         test_results = json.loads(res_output["stdout"])
+
+        if len(SubmissionService._judge0_results) >= JUDGE0_RESULTS_CACHE_SIZE:
+            # Evict the oldest result, dicts keep insertion order
+            del SubmissionService._judge0_results[
+                next(iter(SubmissionService._judge0_results))
+            ]
+        SubmissionService._judge0_results[zip_hash] = test_results["tests"]
         return test_results["tests"]
 
+    async def poll_judge0(self, token: str) -> dict:
+        """Polls judge0 with exponential backoff until a queued submission finishes running
+        Args:
+            token: the token judge0 returned when the submission was queued
+        Returns:
+            The judge0 submission JSON with its stdout and status fields
+        Raises:
+            RuntimeError: If judge0 errors or the submission is still pending after JUDGE0_MAX_WAIT_SECONDS
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + JUDGE0_MAX_WAIT_SECONDS
+        delay = 0.1
+        while loop.time() < deadline:
+            res = await judge0_client.get(
+                f"/submissions/{token}", params={"fields": "stdout,status"}
+            )
+            if res.status_code != 200:
+                raise RuntimeError(
+                    "Judge0 did not return as expected, please ensure it is running and try again."
+                )
+
+            res_output = res.json()
+            if res_output["status"]["id"] not in JUDGE0_PENDING_STATUSES:
+                return res_output
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+        raise RuntimeError(
+            f"Judge0 did not finish running the submission within {JUDGE0_MAX_WAIT_SECONDS:.0f} seconds, please ensure it is running and try again."
+        )
+
     def package_submission(
         self, team_name: str, question_number: int, demo=False
     ) -> bytes:
@@ -194,43 +268,67 @@ class SubmissionService:
         and includes autograder utils from the gradescope_utils package.
         """
 
-        utils_dir = "backend/autograder_utils"
         question_dir = os.path.join("es_files", "questions", f"q{question_number}")
 
-        with BytesIO() as f:  # Creates an in memory buffer we can use just like a file
-            with ZipFile(
-                f, "w"
-            ) as new_zip:  # Creates a new zip in memory we can add to
-                # Add all files in autograder_utils
-                if not os.path.exists(utils_dir):
-                    raise ResourceNotFoundException("No Utils Created.")
-
-                for file in os.listdir(utils_dir):
-                    new_zip.write(os.path.join(utils_dir, file), arcname=file)
-
-                # Add test/demo case file
-                if demo:
-                    path = os.path.join(question_dir, "demo_cases.py")
-                    if not os.path.exists(path):
-                        raise ResourceNotFoundException(
-                            f"Question {question_number} not found"
-                        )
-                    new_zip.write(path, arcname="demo_cases.py")
-                else:
-                    path = os.path.join(question_dir, "test_cases.py")
-                    if not os.path.exists(path):
-                        raise ResourceNotFoundException(
-                            f"Demo cases for question {question_number} not found"
-                        )
-                    new_zip.write(path, arcname="test_cases.py")
-
-                # Add submission file
-                path = os.path.join(
-                    submissions_dir, f"q{question_number}", f"{team_name}.py"
+        # Read test/demo case file
+        if demo:
+            arcname = "demo_cases.py"
+            not_found_message = f"Question {question_number} not found"
+        else:
+            arcname = "test_cases.py"
+            not_found_message = f"Demo cases for question {question_number} not found"
+        path = os.path.join(question_dir, arcname)
+        try:
+            test_cases = _read_question_file(path, os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            raise ResourceNotFoundException(not_found_message)
+
+        # Read submission file
+        path = os.path.join(submissions_dir, f"q{question_number}", f"{team_name}.py")
+        try:
+            with open(path, "rb") as f:
+                submission_file = f.read()
+        except FileNotFoundError:
+            raise ResourceNotFoundException(
+                f"Team {team_name} did not submit question {question_number}"
+            )
+
+        # Start from the already zipped autograder_utils and append this submission's files.
+        # ZipInfo entries get a fixed timestamp, so the same files always produce the same zip
+        with BytesIO(_utils_zip()) as f:
+            with ZipFile(f, "a") as new_zip:
+                new_zip.writestr(
+                    ZipInfo(arcname),
+                    test_cases,
+                    compress_type=ZIP_DEFLATED,
+                    compresslevel=6,
+                )
+                new_zip.writestr(
+                    ZipInfo("submission.py"),
+                    submission_file,
+                    compress_type=ZIP_DEFLATED,
+                    compresslevel=6,
                 )
-                if not os.path.exists(path):
-                    raise ResourceNotFoundException(
-                        f"Team {team_name} did not submit question {question_number}"
-                    )
-                new_zip.write(path, arcname="submission.py")
             return base64.b64encode(f.getvalue())
+
+
+@lru_cache(maxsize=1)
+def _utils_zip() -> bytes:
+    """Zips every file in autograder_utils. These never change while the server runs,
+    so the zip is built on the first submission and reused for all later ones."""
+    if not os.path.exists(utils_dir):
+        raise ResourceNotFoundException("No Utils Created.")
+
+    with BytesIO() as f:
+        with ZipFile(f, "w", compression=ZIP_DEFLATED, compresslevel=6) as utils_zip:
+            for file in os.listdir(utils_dir):
+                utils_zip.write(os.path.join(utils_dir, file), arcname=file)
+        return f.getvalue()
+
+
+@lru_cache(maxsize=128)
+def _read_question_file(path: str, mtime_ns: int) -> bytes:
+    """Reads a test/demo case file. The modification time is part of the cache key
+    so edits to a question's tests are picked up without a restart."""
+    with open(path, "rb") as f:
+        return f.read()
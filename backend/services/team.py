@@ -5,7 +5,6 @@ from ..db import db_session
 from fastapi import Depends
 from sqlmodel import Session, select, and_, delete
 import polars as pl
-import datetime as dt
 
 from .exceptions import (
     ResourceNotFoundException,
@@ -18,6 +17,7 @@ from ..models import Team, TeamData, TeamMember, TeamMemberCreate
 __authors__ = ["Nicholas Almy", "Mustafa Aljumayli", "Andrew Lockard"]
 
 WORD_LIST = "/workspaces/SOTestingEnv/es_files/unique_words.csv"
+TIME_PATTERN = r"^\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}$"
 
 """For now, password creation is done off of the database. Will need to rework
 to integrate it into the db"""
@@ -31,57 +31,45 @@ class TeamService:
     ):  # Add all dependencies via FastAPI injection in the constructor
         self._session = session
 
-    def df_row_to_team(self, team_df: pl.DataFrame) -> TeamData:
-        """Converts a DataFrame row to a Team object.
-        Args:
-            team_df (pl.DataFrame): DataFrame row to convert
-        Returns:
-            Team: Team object created from the DataFrame row
-        """
-        try:
-            team = TeamData(
-                name=team_df["Team Number"],
-                password=team_df["Password"],
-                start_time=dt.datetime.strptime(
-                    team_df["Start Time"], "%m/%d/%Y %H:%M"
-                ),
-                end_time=dt.datetime.strptime(team_df["End Time"], "%m/%d/%Y %H:%M"),
-            )
-        except ValueError:
-            raise ValueError(f"ValueError while processing {team_df}")
-        except TypeError:
-            raise TypeError(f"TypeError while processing {team_df}")
-        return team
-
     def df_to_teams(self, teams_df: pl.DataFrame) -> list[TeamData]:
         """Converts a DataFrame to a list of Team objects.
         Args:
             teams_df (pl.DataFrame): DataFrame to convert
         Returns:
             list[Team]: List of Team objects created from the DataFrame
+        Raises:
+            ValueError: If a time can not be parsed or a field has an invalid value
+            TypeError: If the time columns do not hold strings
         """
+        if teams_df.is_empty():
+            return []
 
-        teams = []
-        for team in teams_df.iter_rows(named="True"):
-            teams.append(self.df_row_to_team(team))
-        return teams
+        for column in ("Start Time", "End Time"):
+            if teams_df.schema[column] != pl.String:
+                raise TypeError(
+                    f"TypeError while processing {column}, expected strings but got {teams_df.schema[column]}"
+                )
+            # Polars accepts years with fewer than four digits, so check the format first
+            if not teams_df.select(pl.col(column).str.contains(TIME_PATTERN).all()).item():
+                raise ValueError(
+                    f"ValueError while processing {column}, expected times like 01/31/2025 09:00"
+                )
 
-    def team_to_df(self, team: TeamData) -> pl.DataFrame:
-        """Converts a TeamData object to a DataFrame row.
-        Args:
-            team (TeamData): Team object to convert
-        Returns:
-            pl.DataFrame: DataFrame row created from the Team object
-        """
-        team_df = pl.DataFrame(
-            {
-                "Team Number": [team.name],
-                "Password": [team.password],
-                "Start Time": [team.start_time.strftime("%m/%d/%Y %H:%M")],
-                "End Time": [team.end_time.strftime("%m/%d/%Y %H:%M")],
-            }
-        )
-        return team_df
+        # Parse whole time columns at once instead of calling strptime for every row
+        try:
+            teams_df = teams_df.select(
+                pl.col("Team Number").alias("name"),
+                pl.col("Password").alias("password"),
+                pl.col("Start Time")
+                .str.strptime(pl.Datetime, "%m/%d/%Y %H:%M")
+                .alias("start_time"),
+                pl.col("End Time")
+                .str.strptime(pl.Datetime, "%m/%d/%Y %H:%M")
+                .alias("end_time"),
+            )
+        except pl.exceptions.InvalidOperationError as e:
+            raise ValueError(f"ValueError while processing times: {e}") from e
+        return [TeamData(**team) for team in teams_df.to_dicts()]
 
     def teams_to_df(self, teams: list[TeamData]) -> pl.DataFrame:
         """Converts a list of TeamData objects to a DataFrame.
@@ -90,13 +78,28 @@ class TeamService:
         Returns:
             pl.DataFrame: DataFrame created from the list of Team objects
         """
-        team_dfs = []
-        for team in teams:
-            team_dfs.append(self.team_to_df(team))
-        return pl.concat(team_dfs)
+        # Build each column in one pass rather than concatenating one-row frames
+        return pl.DataFrame(
+            {
+                "Team Number": [team.name for team in teams],
+                "Password": [team.password for team in teams],
+                "Start Time": [
+                    team.start_time.strftime("%m/%d/%Y %H:%M") for team in teams
+                ],
+                "End Time": [
+                    team.end_time.strftime("%m/%d/%Y %H:%M") for team in teams
+                ],
+            },
+            schema={
+                "Team Number": pl.String,
+                "Password": pl.String,
+                "Start Time": pl.String,
+                "End Time": pl.String,
+            },
+        )
 
     def update_team(self, team: TeamData) -> TeamData:
-        """Update a team in the database.
+        """Update a team in the database, the caller is responsible for committing.
         Args:
             team (Team): Team object to update
         Returns:
@@ -113,13 +116,12 @@ class TeamService:
             existing_team.start_time = team.start_time
             existing_team.end_time = team.end_time
             self._session.add(existing_team)
-            self._session.commit()
             return existing_team
         else:
             raise ResourceNotFoundException("Team", team.name)
 
     def create_team(self, team: Team | TeamData) -> Team:
-        """Create a new team in the database.
+        """Create a new team in the database, the caller is responsible for committing.
         Args:
             team (Team): Team object to create
         Returns:
@@ -133,9 +135,43 @@ class TeamService:
                 end_time=team.end_time,
             )
         self._session.add(team)
-        self._session.commit()
         return team
 
+    def upsert_teams(self, teams: list[Team | TeamData]) -> list[Team]:
+        """Updates teams that already exist (matched by name) and creates the rest.
+
+        The existing teams are looked up in a single query and nothing is committed,
+        so a whole table of teams can be written with one commit by the caller.
+        Args:
+            teams (list[Team | TeamData]): Teams to update or create
+        Returns:
+            list[Team]: The Team objects now tracked by the session
+        """
+        existing_teams: dict[str, Team] = {
+            team.name: team
+            for team in self._session.exec(
+                select(Team).where(Team.name.in_([team.name for team in teams]))
+            )
+        }
+        upserted_teams = []
+        for team in teams:
+            db_team = existing_teams.get(team.name)
+            if db_team is None:
+                db_team = Team(
+                    name=team.name,
+                    password=team.password,
+                    start_time=team.start_time,
+                    end_time=team.end_time,
+                )
+                existing_teams[team.name] = db_team
+            else:
+                db_team.password = team.password
+                db_team.start_time = team.start_time
+                db_team.end_time = team.end_time
+            upserted_teams.append(db_team)
+        self._session.add_all(upserted_teams)
+        return upserted_teams
+
     def get_team(self, identifier) -> Team:
         """Gets the team by id (int) or name (str)"""
         # TODO: Improve documentation
@@ -178,6 +214,15 @@ class TeamService:
         self._session.commit()
         return True
 
+    def delete_teams(self, teams: list[Team]) -> None:
+        """Deletes a batch of teams and their members without committing.
+        Args:
+            teams (list[Team]): Teams in the database to delete
+        """
+        team_ids = [team.id for team in teams]
+        self._session.exec(delete(TeamMember).where(TeamMember.team_id.in_(team_ids)))
+        self._session.exec(delete(Team).where(Team.id.in_(team_ids)))
+
     def delete_team(self, team: TeamData | Team) -> bool:
         """Deletes a team"""
         team = self.get_team(team.name)
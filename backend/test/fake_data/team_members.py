@@ -21,9 +21,7 @@ def insert_fake_team_members(session: Session):
     member4 = TeamMember(first_name="Nick", last_name="Almy", id=None, team_id=1)
     member5 = TeamMember(first_name="Saba", last_name="Supervisor", id=None, team_id=2)
 
-    members = [member1, member2, member3, member4, member5]
-    for member in members:
-        session.add(member)
+    session.add_all([member1, member2, member3, member4, member5])
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -14,9 +14,8 @@ corpus = pl.read_csv(WORD_LIST)["word"]
 
 def create_words(session: Session):
     """Adds the fake password data for testing purposes with hashed passwords."""
-    for word in corpus:
-        word = Word(word=word)
-        session.add(word)
+    # Plain row mappings skip building and tracking an ORM object per word
+    session.bulk_insert_mappings(Word, [{"word": word} for word in corpus])
 
 
 @pytest.fixture()
@@ -0,0 +1,47 @@
+"""File to contain all PasswordService related tests"""
+
+from datetime import datetime
+
+from backend.models import Team
+from .fixtures import password_svc, team_svc
+from .fake_data.team import fake_team_fixture
+from .fake_data.word import create_words_fixture
+
+
+def test_generate_passwords_keeps_db_password(
+    password_svc, team_svc, fake_team_fixture
+):
+    """Test that a team missing a password reuses the one stored in the database"""
+    fake_team_fixture()
+    team = Team(
+        name="B1", start_time=datetime.now(), end_time=datetime.now(), password=None
+    )
+    teams = password_svc.generate_passwords([team], team_svc)
+    assert teams[0].password == "a-b-c"
+
+
+def test_generate_passwords_new_team(
+    password_svc, team_svc, fake_team_fixture, create_words_fixture
+):
+    """Test that a team not in the database gets a newly generated password"""
+    fake_team_fixture()
+    team = Team(
+        name="C4", start_time=datetime.now(), end_time=datetime.now(), password=None
+    )
+    teams = password_svc.generate_passwords([team], team_svc)
+    assert len(teams[0].password.split("-")) == 3
+
+
+def test_generate_passwords_keeps_given_password(
+    password_svc, team_svc, fake_team_fixture
+):
+    """Test that a team that already has a password is left unchanged"""
+    fake_team_fixture()
+    team = Team(
+        name="B1",
+        start_time=datetime.now(),
+        end_time=datetime.now(),
+        password="x-y-z",
+    )
+    teams = password_svc.generate_passwords([team], team_svc)
+    assert teams[0].password == "x-y-z"
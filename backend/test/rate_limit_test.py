@@ -0,0 +1,87 @@
+"""File to contain all RateLimiter related tests"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import jwt
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from backend.api.rate_limit import RateLimiter
+from backend.config import SECRET_KEY
+from backend.models.auth import TokenData
+from backend.services.exceptions import (
+    InvalidCredentialsException,
+    TooManyRequestsException,
+)
+from .fixtures import auth_svc, team_svc
+
+
+def login(team_id: int, name: str, minutes: int = 30) -> HTTPAuthorizationCredentials:
+    """Creates the credentials a team sends after logging in, minutes sets the token's expiration"""
+    token_data = TokenData(
+        id=team_id,
+        name=name,
+        exp=datetime.now(tz=timezone.utc) + timedelta(minutes=minutes),
+    )
+    token = jwt.encode(token_data.model_dump(), SECRET_KEY, algorithm="HS256")
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def new_limiter(times: int, seconds: float) -> RateLimiter:
+    """Creates a RateLimiter whose clock starts at 0"""
+    with patch("backend.api.rate_limit.time.monotonic", return_value=0.0):
+        return RateLimiter(times=times, seconds=seconds)
+
+
+def call(limiter: RateLimiter, credentials, auth_svc, now: float) -> None:
+    """Calls the limiter dependency directly at the time now"""
+    with patch("backend.api.rate_limit.time.monotonic", return_value=now):
+        asyncio.run(limiter(credentials, auth_svc))
+
+
+def test_rate_limiter_blocks_over_limit(auth_svc):
+    """Tests that requests past the limit raise until the window moves on"""
+    credentials = login(1, "B1")
+    limiter = new_limiter(times=3, seconds=10)
+
+    for now in (1.0, 2.0, 3.0):
+        call(limiter, credentials, auth_svc, now)
+    with pytest.raises(TooManyRequestsException):
+        call(limiter, credentials, auth_svc, 4.0)
+
+    # The request at 1.0 has left the window
+    call(limiter, credentials, auth_svc, 11.5)
+    with pytest.raises(TooManyRequestsException):
+        call(limiter, credentials, auth_svc, 11.6)
+
+
+def test_rate_limiter_keyed_by_team(auth_svc):
+    """Tests that logging in again shares a limit while other teams have their own"""
+    first_login = login(1, "B1", minutes=30)
+    second_login = login(1, "B1", minutes=60)
+    limiter = new_limiter(times=1, seconds=10)
+
+    call(limiter, first_login, auth_svc, 1.0)
+    call(limiter, login(2, "B2"), auth_svc, 1.0)
+    with pytest.raises(TooManyRequestsException):
+        call(limiter, second_login, auth_svc, 2.0)
+
+
+def test_rate_limiter_invalid_token(auth_svc):
+    """Tests that invalid tokens are rejected without being tracked"""
+    limiter = new_limiter(times=1, seconds=10)
+    junk = HTTPAuthorizationCredentials(scheme="Bearer", credentials="junk")
+    with pytest.raises(InvalidCredentialsException):
+        call(limiter, junk, auth_svc, 1.0)
+    assert limiter._requests == {}
+
+
+def test_rate_limiter_forgets_idle_teams(auth_svc):
+    """Tests that teams idle for a whole window are dropped from memory"""
+    limiter = new_limiter(times=5, seconds=10)
+
+    call(limiter, login(1, "B1"), auth_svc, 1.0)
+    call(limiter, login(2, "B2"), auth_svc, 25.0)
+    assert list(limiter._requests) == ["B2"]
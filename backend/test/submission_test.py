@@ -0,0 +1,168 @@
+"""File to contain all SubmissionService related tests"""
+
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+from backend.services import submissions
+from backend.services.submissions import SubmissionService
+from .fixtures import submission_svc
+
+FINISHED = {"id": 3, "description": "Accepted"}
+IN_QUEUE = {"id": 1, "description": "In Queue"}
+TESTS = [
+    {"name": "test_1 (test_cases.Test)", "score": 1, "max_score": 1, "status": "passed"}
+]
+
+
+class FakeJudge0:
+    """Stands in for judge0, returning statuses in order for every poll"""
+
+    def __init__(self, statuses: list[dict] | None = None, poll_status_code: int = 200):
+        self.posts = 0
+        self.polls = 0
+        self._statuses = statuses or [FINISHED]
+        self._poll_status_code = poll_status_code
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            self.posts += 1
+            return httpx.Response(201, json={"token": f"token-{self.posts}"})
+
+        status = self._statuses[min(self.polls, len(self._statuses) - 1)]
+        self.polls += 1
+        return httpx.Response(
+            self._poll_status_code,
+            json={"status": status, "stdout": json.dumps({"tests": TESTS})},
+        )
+
+
+@pytest.fixture()
+def judge0(monkeypatch):
+    """Swaps the judge0 client for one answered by a FakeJudge0 and empties the results cache"""
+
+    def use(fake: FakeJudge0) -> FakeJudge0:
+        monkeypatch.setattr(
+            submissions,
+            "judge0_client",
+            httpx.AsyncClient(
+                base_url="http://judge0", transport=httpx.MockTransport(fake)
+            ),
+        )
+        return fake
+
+    monkeypatch.setattr(SubmissionService, "_judge0_results", {})
+    return use
+
+
+@pytest.fixture()
+def question_files(tmp_path, monkeypatch):
+    """Creates autograder utils, a question's test cases and a team's submission under tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    submissions._utils_zip.cache_clear()
+
+    utils = tmp_path / "backend" / "autograder_utils"
+    utils.mkdir(parents=True)
+    (utils / "run_tests.py").write_text("print('running')\n")
+
+    test_cases = tmp_path / "es_files" / "questions" / "q1" / "test_cases.py"
+    test_cases.parent.mkdir(parents=True)
+    test_cases.write_text("@weight(1)\ndef test_1(): pass\n")
+
+    submission = tmp_path / "es_files" / "submissions" / "q1" / "B1.py"
+    submission.parent.mkdir(parents=True)
+    submission.write_text("print('hello')\n")
+
+    yield test_cases, submission
+    submissions._utils_zip.cache_clear()
+
+
+def grade(submission_svc: SubmissionService) -> list[dict]:
+    """Packages team B1's question 1 submission and sends it to judge0"""
+    submission_zip = submission_svc.package_submission("B1", 1)
+    return asyncio.run(submission_svc.send_to_judge0(submission_zip))
+
+
+def rewrite(path, contents: str) -> None:
+    """Rewrites a file and moves its modification time forward so caches see the change"""
+    stat = os.stat(path)
+    path.write_text(contents)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_package_submission_deterministic(submission_svc, question_files):
+    """Test that packaging unchanged files gives the same zip even when their times change"""
+    _, submission = question_files
+    first = submission_svc.package_submission("B1", 1)
+    os.utime(submission, ns=(0, 1_000_000_000))
+    assert submission_svc.package_submission("B1", 1) == first
+
+
+def test_send_to_judge0_cache_hit(submission_svc, question_files, judge0):
+    """Test that a repeated identical submission is only sent to judge0 once"""
+    fake = judge0(FakeJudge0())
+    assert grade(submission_svc) == TESTS
+    assert grade(submission_svc) == TESTS
+    assert fake.posts == 1
+
+
+def test_send_to_judge0_changed_submission(submission_svc, question_files, judge0):
+    """Test that changing the submission misses the cache"""
+    _, submission = question_files
+    fake = judge0(FakeJudge0())
+    grade(submission_svc)
+    rewrite(submission, "print('goodbye')\n")
+    grade(submission_svc)
+    assert fake.posts == 2
+
+
+def test_send_to_judge0_changed_test_cases(submission_svc, question_files, judge0):
+    """Test that changing a question's test cases misses the cache"""
+    test_cases, _ = question_files
+    fake = judge0(FakeJudge0())
+    grade(submission_svc)
+    rewrite(test_cases, "@weight(2)\ndef test_1(): pass\n")
+    grade(submission_svc)
+    assert fake.posts == 2
+
+
+def test_send_to_judge0_evicts_oldest(submission_svc, judge0, monkeypatch):
+    """Test that the oldest result is evicted once the cache is full"""
+    monkeypatch.setattr(submissions, "JUDGE0_RESULTS_CACHE_SIZE", 2)
+    fake = judge0(FakeJudge0())
+    for submission_zip in (b"first", b"second", b"third"):
+        asyncio.run(submission_svc.send_to_judge0(submission_zip))
+    assert len(SubmissionService._judge0_results) == 2
+
+    # second is still cached, first was evicted and has to be sent again
+    asyncio.run(submission_svc.send_to_judge0(b"second"))
+    assert fake.posts == 3
+    asyncio.run(submission_svc.send_to_judge0(b"first"))
+    assert fake.posts == 4
+
+
+def test_poll_judge0_waits_for_pending(submission_svc, judge0):
+    """Test that polling continues past pending statuses until the submission finishes"""
+    fake = judge0(FakeJudge0([IN_QUEUE, IN_QUEUE, FINISHED]))
+    res_output = asyncio.run(submission_svc.poll_judge0("token"))
+    assert res_output["status"] == FINISHED
+    assert fake.polls == 3
+
+
+def test_poll_judge0_error_status(submission_svc, judge0):
+    """Test that a poll that judge0 does not answer with 200 raises a RuntimeError"""
+    judge0(FakeJudge0(poll_status_code=500))
+    with pytest.raises(RuntimeError):
+        asyncio.run(submission_svc.poll_judge0("token"))
+
+
+def test_poll_judge0_deadline(submission_svc, judge0, monkeypatch):
+    """Test that a submission still pending after JUDGE0_MAX_WAIT_SECONDS raises a RuntimeError"""
+    monkeypatch.setattr(submissions, "JUDGE0_MAX_WAIT_SECONDS", 0.2)
+    fake = judge0(FakeJudge0([IN_QUEUE]))
+    with pytest.raises(RuntimeError):
+        asyncio.run(submission_svc.poll_judge0("token"))
+    assert fake.polls >= 2
@@ -271,3 +271,86 @@ def test_team_member_not_allowed_deleting(team_svc, fake_team_fixture):
         team_svc.delete_team_member(
             team_svc.get_team("B2").members[0].id, team_svc.get_team("B1")
         )
+
+
+def test_teams_to_df_empty(team_svc):
+    """Test that an empty list of teams converts to an empty DataFrame with the team columns"""
+    df = team_svc.teams_to_df([])
+    assert len(df) == 0
+    assert df.columns == ["Team Number", "Password", "Start Time", "End Time"]
+
+
+def test_upsert_teams_basic(team_svc, fake_team_fixture):
+    """Test that upserting updates existing teams by name and creates new ones"""
+    fake_team_fixture()
+    teams = [
+        TeamData(
+            name="B1",
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            password="x-y-z",
+        ),
+        TeamData(
+            name="C4",
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            password="password",
+        ),
+    ]
+    team_svc.upsert_teams(teams)
+    assert team_svc.get_team("B1").password == "x-y-z"
+    assert team_svc.get_team("B1").id == 1
+    assert team_svc.get_team("C4").password == "password"
+    assert len(team_svc.get_all_teams()) == 4
+
+
+def test_delete_teams_basic(team_svc, fake_team_fixture, session):
+    """Test that deleting a batch of teams also deletes their team members"""
+    fake_team_fixture()
+    team_svc.delete_teams([team_svc.get_team("B1"), team_svc.get_team("B2")])
+    assert [team.name for team in team_svc.get_all_teams()] == ["B3"]
+    assert session.get(TeamMember, 1) is None
+
+
+def test_df_to_teams_parses_times(team_svc):
+    """Test that the time columns of a DataFrame are parsed into datetimes"""
+    new_teams = pl.DataFrame(
+        {
+            "Team Number": ["C4", "C5"],
+            "Start Time": ["10/14/2026 09:00", "10/14/2026 10:30"],
+            "End Time": ["10/14/2026 10:00", "10/14/2026 11:30"],
+            "Password": ["password", "a-b-c"],
+        }
+    )
+    teams = team_svc.df_to_teams(new_teams)
+    assert [team.name for team in teams] == ["C4", "C5"]
+    assert teams[1].start_time == datetime(2026, 10, 14, 10, 30)
+    assert teams[1].end_time == datetime(2026, 10, 14, 11, 30)
+
+
+def test_df_to_teams_bad_time(team_svc):
+    """Test that a value error is raised when a time is not in the expected format"""
+    new_team = pl.DataFrame(
+        {
+            "Team Number": ["C4"],
+            "Start Time": ["9:00 AM"],
+            "End Time": [datetime.now().strftime("%m/%d/%Y %H:%M")],
+            "Password": ["password"],
+        }
+    )
+    with pytest.raises(ValueError):
+        team_svc.df_to_teams(new_team)
+
+
+def test_df_to_teams_short_year(team_svc):
+    """Test that a value error is raised when a time has a two digit year"""
+    new_team = pl.DataFrame(
+        {
+            "Team Number": ["C4"],
+            "Start Time": ["10/14/26 09:00"],
+            "End Time": [datetime.now().strftime("%m/%d/%Y %H:%M")],
+            "Password": ["password"],
+        }
+    )
+    with pytest.raises(ValueError):
+        team_svc.df_to_teams(new_team)